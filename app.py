@@ -1,21 +1,55 @@
+import bisect
+
 import pynecone as pc
 
+def get_page(indices, cursor, page_size):
+    """Return the indices after the cursor, at most one page long."""
+    start = bisect.bisect_right(indices, cursor) if cursor else 0
+    return indices[start:start + page_size]
+
 class State(pc.State):
-    missing_indices: list[str] = ["index1", "index2"]
-    
+    # Backend-only full list; only the current page is sent to the client
+    _missing_indices: list[str] = ["index1", "index2"]
+    page_size: int = 100
+    cursor: str = ""  # Last index name of the previous page
+    page: list[str] = get_page(_missing_indices, cursor, page_size)
+
     def refresh(self):
         # Add ES query here
-        self.missing_indices = ["index3", "index4"]
+        new = sorted(["index3", "index4"])
+        # Only reassign when something changed so unchanged refreshes send no state
+        if new != self._missing_indices:
+            self._missing_indices = new
+            self.cursor = ""
+            self.page = get_page(new, self.cursor, self.page_size)
+
+    def next_page(self):
+        if not self.page:
+            return
+        # Stay on the last page rather than moving to an empty one
+        page = get_page(self._missing_indices, self.page[-1], self.page_size)
+        if page:
+            self.cursor = self.page[-1]
+            self.page = page
+
+    def first_page(self):
+        if self.cursor:
+            self.cursor = ""
+            self.page = get_page(self._missing_indices, self.cursor, self.page_size)
 
 def index():
     return pc.vstack(
         pc.heading("ES Sync", font_size="2em"),
         pc.button("Refresh", on_click=State.refresh),
         pc.list(
-            pc.foreach(State.missing_indices, lambda idx: pc.list_item(idx)),
+            pc.foreach(State.page, lambda idx: pc.list_item(idx)),
+        ),
+        pc.hstack(
+            pc.button("First", on_click=State.first_page),
+            pc.button("Next", on_click=State.next_page),
         )
     )
 
 app = pc.App(state=State)
 app.add_page(index)
-app.compile()
\ No newline at end of file
+app.compile()
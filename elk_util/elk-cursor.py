@@ -1,6 +1,17 @@
+import asyncio
+import httpx
+import ijson
+import json
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import logging
+import functools
+import heapq
+import operator
+import re
 from datetime import datetime
 
 # Configure logging
@@ -25,6 +36,31 @@ PASSIVE_CLUSTER = {
 # Shared snapshot repository configuration
 SNAPSHOT_REPO = 'snapshot-repo-2'  # Your snapshot repository name
 MAX_RESTORE_BYTES = 500 * 10**9
+RESTORE_CONCURRENCY = 8  # Number of indices restored in parallel
+RESTORE_TIMEOUT = 3600  # Minimum seconds to wait for a blocking restore call
+ASSUMED_RESTORE_BYTES_PER_SEC = 20 * 1024**2  # Conservative per-index restore throughput
+RETRY_STATUSES = (502, 503, 504)  # Transient gateway errors worth retrying
+
+def create_session():
+    """Create a pooled keep-alive HTTP session for a cluster."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=RETRY_STATUSES)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+# One session per cluster so connections are reused across calls
+ACTIVE_SESSION = create_session()
+PASSIVE_SESSION = create_session()
+
+def get_session(cluster_config):
+    """Return the shared session for the given cluster."""
+    return ACTIVE_SESSION if cluster_config is ACTIVE_CLUSTER else PASSIVE_SESSION
 
 # System indices that should be skipped
 SYSTEM_INDICES = [
@@ -37,20 +73,25 @@ SYSTEM_INDICES = [
     '.internal.',
     '.slo-'
 ]
+_SYS_PREFIXES = tuple(SYSTEM_INDICES)
+
+# Parses _cat size strings such as '12.5gb' or '300b'
+_SIZE_RE = re.compile(r'^([\d.]+)\s*([kmgt]?)b$', re.I)
+_MULT = {'': 1, 'k': 1024, 'm': 1024**2, 'g': 1024**3, 't': 1024**4}
 
 def is_system_index(index_name):
     """Check if an index is a system index."""
-    return any(index_name.startswith(prefix) for prefix in SYSTEM_INDICES)
+    return index_name.startswith(_SYS_PREFIXES)
 
 def verify_repository(cluster_config, repo_name):
     """Verify if the repository exists on the cluster."""
     try:
         # First check if repository exists
-        r = requests.get(f"{cluster_config['url']}/_snapshot/{repo_name}")
+        r = get_session(cluster_config).get(f"{cluster_config['url']}/_snapshot/{repo_name}")
         r.raise_for_status()
         
         # Then verify repository status
-        status_r = requests.get(f"{cluster_config['url']}/_snapshot/{repo_name}/_status")
+        status_r = get_session(cluster_config).get(f"{cluster_config['url']}/_snapshot/{repo_name}/_status")
         status_r.raise_for_status()
         
         logging.info(f"Repository {repo_name} exists and is accessible on {cluster_config['url']}")
@@ -64,37 +105,62 @@ def verify_repository(cluster_config, repo_name):
 def get_latest_snapshot():
     """Get the latest snapshot from the active cluster."""
     try:
-        r = requests.get(f"{ACTIVE_CLUSTER['url']}/_cat/snapshots/{SNAPSHOT_REPO}?format=json")
+        r = ACTIVE_SESSION.get(f"{ACTIVE_CLUSTER['url']}/_cat/snapshots/{SNAPSHOT_REPO}"
+                               f"?format=json&h=id,end_epoch&s=end_epoch:desc")
         r.raise_for_status()
         snapshots = r.json()
         if not snapshots:
             logging.error(f"No snapshots found in repository {SNAPSHOT_REPO}")
             return None
-        latest = max(snapshots, key=lambda s: s['end_epoch'])
-        logging.info(f"Found latest snapshot: {latest['id']} from {datetime.fromtimestamp(int(latest['end_epoch'])/1000)}")
+        latest = snapshots[0]
+        logging.info("Found latest snapshot: %s from %s",
+                     latest['id'], datetime.fromtimestamp(int(latest['end_epoch'])))
         return latest['id']
     except requests.exceptions.RequestException as e:
         logging.error(f"Failed to get latest snapshot from {ACTIVE_CLUSTER['url']}: {str(e)}")
         return None
 
+@functools.lru_cache(maxsize=8)
+def _snapshot_exists(passive_url, repo, snapshot):
+    """Fetch snapshot metadata once per run; raises on failure so errors are not cached."""
+    r = PASSIVE_SESSION.get(f"{passive_url}/_snapshot/{repo}/{snapshot}")
+    r.raise_for_status()
+    return True
+
 def verify_snapshot_exists(snapshot):
     """Verify if the snapshot exists in the repository on passive cluster."""
     try:
-        r = requests.get(f"{PASSIVE_CLUSTER['url']}/_snapshot/{SNAPSHOT_REPO}/{snapshot}")
-        r.raise_for_status()
+        _snapshot_exists(PASSIVE_CLUSTER['url'], SNAPSHOT_REPO, snapshot)
         logging.info(f"Snapshot {snapshot} exists in repository {SNAPSHOT_REPO}")
         return True
     except requests.exceptions.RequestException as e:
         logging.error(f"Snapshot {snapshot} not found in repository {SNAPSHOT_REPO}: {str(e)}")
         return False
 
+@functools.lru_cache(maxsize=8)
+def _snapshot_indices(repo, snapshot):
+    """Fetch and cache index sizes for a snapshot from the active cluster."""
+    base_url = f"{ACTIVE_CLUSTER['url']}/_snapshot/{repo}/{snapshot}"
+
+    # Snapshot info with index_details carries sizes without per-shard detail (ES 7.13+)
+    r = ACTIVE_SESSION.get(f"{base_url}?index_details=true"
+                           f"&filter_path=snapshots.index_details.*.size_in_bytes")
+    if r.ok:
+        details = r.json().get('snapshots', [{}])[0].get('index_details')
+        if details:
+            return {name: idx['size_in_bytes'] for name, idx in details.items()}
+
+    # Fall back to the status API, trimmed to the size field only
+    r = ACTIVE_SESSION.get(f"{base_url}/_status"
+                           f"?filter_path=snapshots.indices.*.stats.total.size_in_bytes")
+    r.raise_for_status()
+    indices = r.json()['snapshots'][0]['indices']
+    return {name: idx['stats']['total']['size_in_bytes'] for name, idx in indices.items()}
+
 def get_snapshot_indices(snapshot):
     """Get indices and their sizes from a snapshot."""
     try:
-        r = requests.get(f"{ACTIVE_CLUSTER['url']}/_snapshot/{SNAPSHOT_REPO}/{snapshot}/_status")
-        r.raise_for_status()
-        indices = r.json()['snapshots'][0]['indices']
-        return {name: idx['stats']['total']['size_in_bytes'] for name, idx in indices.items()}
+        return dict(_snapshot_indices(SNAPSHOT_REPO, snapshot))
     except requests.exceptions.RequestException as e:
         logging.error(f"Failed to get snapshot indices from {ACTIVE_CLUSTER['url']}: {str(e)}")
         return {}
@@ -102,45 +168,52 @@ def get_snapshot_indices(snapshot):
 def get_local_indices():
     """Get indices and their stats from the passive cluster."""
     try:
-        r = requests.get(f"{PASSIVE_CLUSTER['url']}/_cat/indices?format=json&h=index,docs.count,store.size")
-        r.raise_for_status()
-        indices = {}
-        for idx in r.json():
-            size = idx.get('store.size', '0b')  # Default to 0b if size is None
-            docs_count = idx.get('docs.count', '0')  # Default to '0' if docs.count is None
+        with PASSIVE_SESSION.get(
+            f"{PASSIVE_CLUSTER['url']}/_cat/indices?format=json&bytes=b&h=index,docs.count,store.size",
+            stream=True
+        ) as r:
+            r.raise_for_status()
+            r.raw.decode_content = True
+            indices = {}
+            # Parse rows as they arrive instead of loading the whole response
+            for idx in ijson.items(r.raw, 'item'):
+                if is_system_index(idx['index']):
+                    continue
+                size = idx.get('store.size', '0')  # Default to 0 if size is None
+                docs_count = idx.get('docs.count', '0')  # Default to '0' if docs.count is None
+            
+                # Convert size to bytes
+                size_bytes = 0
+                if size and isinstance(size, str):
+                    try:
+                        if size.isdigit():
+                            size_bytes = int(size)
+                        else:
+                            m = _SIZE_RE.match(size)
+                            if m:
+                                size_bytes = int(float(m.group(1)) * _MULT[m.group(2).lower()])
+                            else:
+                                logging.warning(f"Could not parse size '{size}' for index {idx['index']}")
+                    except (ValueError, TypeError) as e:
+                        logging.warning(f"Could not parse size '{size}' for index {idx['index']}: {str(e)}")
+                        size_bytes = 0
             
-            # Convert size to bytes
-            size_bytes = 0
-            if size and isinstance(size, str):
+                # Convert docs count to integer
                 try:
-                    if size.endswith('b'):
-                        num = float(size[:-2])
-                        if size.endswith('kb'): num *= 1024
-                        elif size.endswith('mb'): num *= 1024**2
-                        elif size.endswith('gb'): num *= 1024**3
-                        elif size.endswith('tb'): num *= 1024**4
-                        size_bytes = int(num)
-                    else:
-                        size_bytes = int(size)
+                    docs = int(docs_count) if docs_count is not None else 0
                 except (ValueError, TypeError) as e:
-                    logging.warning(f"Could not parse size '{size}' for index {idx['index']}: {str(e)}")
-                    size_bytes = 0
+                    logging.warning(f"Could not parse docs count '{docs_count}' for index {idx['index']}: {str(e)}")
+                    docs = 0
             
-            # Convert docs count to integer
-            try:
-                docs = int(docs_count) if docs_count is not None else 0
-            except (ValueError, TypeError) as e:
-                logging.warning(f"Could not parse docs count '{docs_count}' for index {idx['index']}: {str(e)}")
-                docs = 0
-            
-            indices[idx['index']] = {
-                'docs': docs,
-                'size': size_bytes
-            }
-            logging.debug(f"Index {idx['index']}: size={size_bytes} bytes, docs={docs}")
+                indices[idx['index']] = {
+                    'docs': docs,
+                    'size': size_bytes
+                }
+                logging.debug("Index %s: size=%d bytes, docs=%d", idx['index'], size_bytes, docs)
         
         return indices
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, ijson.JSONError) as e:
+        # Streaming reads raw urllib3 data, so transport and parse errors are not wrapped by requests
         logging.error(f"Failed to get local indices from {PASSIVE_CLUSTER['url']}: {str(e)}")
         return {}
 
@@ -150,16 +223,21 @@ def pick_indices_to_restore(snapshot_indices, local_indices):
     for idx, snap_size in snapshot_indices.items():
         # Skip system indices
         if is_system_index(idx):
-            logging.info(f"Skipping system index: {idx}")
+            logging.debug("Skipping system index: %s", idx)
             continue
             
         local = local_indices.get(idx)
         if not local or snap_size > local['size']:
             to_restore.append((idx, snap_size))
-            logging.info(f"Index {idx} needs restore: snapshot size {snap_size}, local size {local['size'] if local else 0}")
+            logging.info("Index %s needs restore: snapshot size %d, local size %d",
+                         idx, snap_size, local['size'] if local else 0)
     
-    # Sort by size (largest first)
-    to_restore.sort(key=lambda x: -x[1])
+    # Take the largest first; the batch can never hold more than
+    # MAX_RESTORE_BYTES // avg_size indices, so only that many are ranked
+    if to_restore:
+        avg_size = sum(size for _, size in to_restore) // len(to_restore)
+        k_estimate = min(len(to_restore), MAX_RESTORE_BYTES // avg_size + 1) if avg_size else len(to_restore)
+        to_restore = heapq.nlargest(k_estimate, to_restore, key=operator.itemgetter(1))
     batch, total = [], 0
     for idx, size in to_restore:
         if total + size > MAX_RESTORE_BYTES:
@@ -169,31 +247,74 @@ def pick_indices_to_restore(snapshot_indices, local_indices):
         total += size
     return batch
 
-def close_index(index):
+def create_async_client():
+    """Create the shared async HTTP client used for per-index operations."""
+    # Transport retries cover connection failures; send_with_retry covers 5xx responses
+    transport = httpx.AsyncHTTPTransport(
+        retries=3,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+    )
+    return httpx.AsyncClient(transport=transport, timeout=60)
+
+async def send_with_retry(client, method, url, retries=3, backoff_factor=0.5, **kwargs):
+    """Send an idempotent request, retrying 502/503/504 responses with backoff."""
+    for attempt in range(retries + 1):
+        r = await client.request(method, url, **kwargs)
+        if r.status_code not in RETRY_STATUSES or attempt == retries:
+            return r
+        await asyncio.sleep(backoff_factor * (2 ** attempt))
+
+async def close_index(client, index):
     """Close an index on the passive cluster."""
     try:
-        r = requests.post(f"{PASSIVE_CLUSTER['url']}/{index}/_close")
+        r = await send_with_retry(client, "POST", f"{PASSIVE_CLUSTER['url']}/{index}/_close")
         r.raise_for_status()
         logging.info(f"Closed index {index}")
         return True
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logging.error(f"Failed to close index {index}: {str(e)}")
         return False
 
-def get_index_doc_count(index, cluster_config):
+async def get_index_doc_count(client, index, cluster_config):
     """Get document count for a specific index from the specified cluster."""
     try:
-        r = requests.get(f"{cluster_config['url']}/{index}/_count")
+        r = await send_with_retry(client, "GET", f"{cluster_config['url']}/{index}/_count")
         r.raise_for_status()
         return r.json()['count']
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logging.error(f"Failed to get document count for {index} from {cluster_config['url']}: {str(e)}")
         return None
 
-def verify_restore_success(index, expected_docs):
+async def get_many_doc_counts(client, indices, cluster_config):
+    """Get document counts for several indices in one _msearch request."""
+    query = json.dumps({"query": {"match_all": {}}, "size": 0, "track_total_hits": True})
+    body = "".join(f"{json.dumps({'index': index})}\n{query}\n" for index in indices)
+    try:
+        r = await send_with_retry(
+            client, "POST",
+            f"{cluster_config['url']}/_msearch",
+            content=body,
+            headers={'Content-Type': 'application/x-ndjson'}
+        )
+        r.raise_for_status()
+        responses = r.json().get('responses', [])
+    except (httpx.HTTPError, ValueError) as e:
+        logging.error(f"Failed to get document counts from {cluster_config['url']}: {str(e)}")
+        return {}
+
+    counts = {}
+    for index, response in zip(indices, responses):
+        if 'error' in response:
+            logging.error(f"Failed to get document count for {index} from {cluster_config['url']}: "
+                          f"{response['error'].get('type')}")
+            continue
+        counts[index] = response['hits']['total']['value']
+    return counts
+
+async def verify_restore_success(client, index, expected_docs):
     """Verify if restore was successful by comparing document counts."""
     try:
-        actual_docs = get_index_doc_count(index, PASSIVE_CLUSTER)
+        actual_docs = await get_index_doc_count(client, index, PASSIVE_CLUSTER)
         if actual_docs is None:
             return False
         
@@ -207,163 +328,165 @@ def verify_restore_success(index, expected_docs):
         logging.error(f"Error verifying restore for {index}: {str(e)}")
         return False
 
-def check_cluster_allocation():
+async def check_cluster_allocation(client):
     """Check cluster allocation settings and status."""
     try:
         # Check allocation settings
         settings_url = f"{PASSIVE_CLUSTER['url']}/_cluster/settings"
-        settings_response = requests.get(settings_url)
-        if settings_response.ok:
+        settings_response = await send_with_retry(client, "GET", settings_url)
+        if settings_response.is_success:
             settings = settings_response.json()
             logging.info(f"Cluster allocation settings: {settings}")
         
         # Check allocation explanation
         explain_url = f"{PASSIVE_CLUSTER['url']}/_cluster/allocation/explain"
-        explain_response = requests.get(explain_url)
-        if explain_response.ok:
+        explain_response = await send_with_retry(client, "GET", explain_url)
+        if explain_response.is_success:
             explain = explain_response.json()
             logging.info(f"Allocation explanation: {explain}")
             
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logging.error(f"Failed to check cluster allocation: {str(e)}")
 
-def restore_index(snapshot, index, expected_docs):
+async def restore_index(client, snapshot, index, expected_docs, snap_size=0, max_retries=3):
     """Restore an index from snapshot to passive cluster."""
+    # Large indices need longer than the default to copy, so scale the wait with size
+    restore_timeout = max(RESTORE_TIMEOUT, snap_size / ASSUMED_RESTORE_BYTES_PER_SEC)
     try:
-        # First verify the snapshot exists and is accessible
-        verify_url = f"{PASSIVE_CLUSTER['url']}/_snapshot/{SNAPSHOT_REPO}/{snapshot}"
-        verify_response = requests.get(verify_url)
-        if not verify_response.ok:
-            logging.error(f"Snapshot verification failed: {verify_response.text}")
-            return False
-
         body = {
             "indices": index,
             "include_global_state": False,
             "include_aliases": True
         }
         
-        restore_url = f"{PASSIVE_CLUSTER['url']}/_snapshot/{SNAPSHOT_REPO}/{snapshot}/_restore"
-        logging.info(f"Attempting to restore index {index} from {restore_url}")
-        
-        r = requests.post(
-            restore_url,
-            json=body,
-            timeout=300  # 5 minute timeout
-        )
-        
-        if not r.ok:
-            logging.error(f"Restore failed with status {r.status_code}: {r.text}")
-            return False
-            
-        logging.info(f"Restore request accepted for index {index}")
-        
-        # Wait for restore to complete by checking index health
-        max_attempts = 30
-        attempt = 0
-        retry_count = 0
-        max_retries = 3
+        # Let the server block until the restore has finished instead of polling
+        restore_url = (f"{PASSIVE_CLUSTER['url']}/_snapshot/{SNAPSHOT_REPO}/{snapshot}/_restore"
+                       f"?wait_for_completion=true&master_timeout=60s")
         
-        while retry_count < max_retries:
-            attempt = 0
-            while attempt < max_attempts:
-                try:
-                    health_url = f"{PASSIVE_CLUSTER['url']}/_cluster/health/{index}"
-                    health_response = requests.get(health_url)
-                    if health_response.ok:
-                        health_data = health_response.json()
-                        status = health_data.get('status')
-                        logging.info(f"Index {index} health check {attempt + 1}/{max_attempts}: status={status}, "
-                                   f"number_of_shards={health_data.get('number_of_shards')}, "
-                                   f"active_shards={health_data.get('active_shards')}, "
-                                   f"relocating_shards={health_data.get('relocating_shards')}, "
-                                   f"initializing_shards={health_data.get('initializing_shards')}, "
-                                   f"unassigned_shards={health_data.get('unassigned_shards')}")
-                        
-                        # Consider both green and yellow as successful states
-                        if status in ['green', 'yellow']:
-                            # Check if all primary shards are allocated
-                            if health_data.get('active_shards', 0) > 0:
-                                # Get current document count
-                                current_docs = get_index_doc_count(index, PASSIVE_CLUSTER)
-                                
-                                if current_docs == expected_docs:
-                                    logging.info(f"Index {index} restored successfully with correct document count")
-                                    return True
-                                else:
-                                    logging.warning(f"Index {index} is {status} but document count doesn't match. "
-                                                  f"Expected {expected_docs}, got {current_docs}. Retrying...")
-                            else:
-                                logging.warning(f"Index {index} is {status} but no active shards. Retrying...")
-                        else:
-                            logging.info(f"Index {index} status is {status}, waiting for green/yellow...")
-                    else:
-                        logging.warning(f"Health check failed for {index}: {health_response.text}")
-                    attempt += 1
-                    time.sleep(10)  # Wait 10 seconds between checks
-                except requests.exceptions.RequestException as e:
-                    logging.warning(f"Error checking restore status for {index}: {str(e)}")
-                    attempt += 1
-                    time.sleep(10)
+        for attempt in range(1, max_retries + 1):
+            logging.info(f"Attempting to restore index {index} from {restore_url}")
+            r = await client.post(
+                restore_url,
+                json=body,
+                timeout=restore_timeout
+            )
             
-            # If we get here, the restore didn't complete successfully
-            retry_count += 1
-            if retry_count < max_retries:
-                logging.warning(f"Restore attempt {retry_count} failed. Retrying restore operation...")
-                # Close the index if it exists
-                close_index(index)
-                # Wait a bit before retrying
-                time.sleep(30)
-                # Try the restore again
-                r = requests.post(restore_url, json=body, timeout=300)
-                if not r.ok:
-                    logging.error(f"Retry restore failed with status {r.status_code}: {r.text}")
-                    return False
-            else:
-                logging.error(f"All {max_retries} restore attempts failed for index {index}")
-                check_cluster_allocation()
+            if not r.is_success:
+                logging.error(f"Restore failed with status {r.status_code}: {r.text}")
                 return False
+                
+            logging.info(f"Restore completed for index {index}")
+            if await verify_restore_success(client, index, expected_docs):
+                logging.info(f"Index {index} restored successfully with correct document count")
+                return True
+            
+            if attempt < max_retries:
+                logging.warning(f"Restore attempt {attempt} failed. Retrying restore operation...")
+                # Close the index before restoring over it again
+                await close_index(client, index)
+                await asyncio.sleep(30)
         
+        logging.error(f"All {max_retries} restore attempts failed for index {index}")
+        await check_cluster_allocation(client)
         return False
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logging.error(f"Failed to restore index {index}: {str(e)}")
         return False
 
-def open_index(index):
+async def open_index(client, index):
     """Open an index on the passive cluster."""
     try:
-        r = requests.post(f"{PASSIVE_CLUSTER['url']}/{index}/_open")
+        r = await send_with_retry(client, "POST", f"{PASSIVE_CLUSTER['url']}/{index}/_open")
         r.raise_for_status()
         logging.info(f"Opened index {index}")
         return True
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logging.error(f"Failed to open index {index}: {str(e)}")
         return False
 
-def wait_for_green(index, max_attempts=30):
+async def wait_for_green(client, index, max_attempts=3, wait_timeout=300):
     """Wait for an index to become green on the passive cluster."""
-    attempt = 0
-    while attempt < max_attempts:
+    # The health API blocks server-side, so only a wall-clock deadline is needed
+    deadline = time.monotonic() + max_attempts * wait_timeout
+    errors = 0
+    while time.monotonic() < deadline:
+        remaining = max(1, min(wait_timeout, int(deadline - time.monotonic())))
         try:
-            r = requests.get(
-                f"{PASSIVE_CLUSTER['url']}/_cluster/health/{index}?wait_for_status=green&timeout=30s",
-                timeout=35  # Slightly longer than the wait timeout
+            r = await send_with_retry(
+                client, "GET",
+                f"{PASSIVE_CLUSTER['url']}/_cluster/health/{index}"
+                f"?filter_path=status,timed_out,active_shards,unassigned_shards"
+                f"&wait_for_status=green&timeout={remaining}s",
+                timeout=remaining + 5  # Slightly longer than the wait timeout
             )
-            r.raise_for_status()
-            if r.json()['status'] == 'green':
+            # A 408 means the server-side wait ran out before green, not a failure
+            if r.status_code != 408:
+                r.raise_for_status()
+            health_data = r.json()
+            if health_data['status'] == 'green' and not health_data.get('timed_out'):
                 logging.info(f"Index {index} is green")
                 return True
-            attempt += 1
-            time.sleep(10)
-        except requests.exceptions.RequestException as e:
+            logging.info(f"Index {index} status is {health_data['status']}, "
+                         f"active_shards={health_data.get('active_shards')}, "
+                         f"unassigned_shards={health_data.get('unassigned_shards')}")
+        except httpx.HTTPStatusError as e:
             logging.error(f"Error checking cluster health for {index}: {str(e)}")
-            attempt += 1
-            time.sleep(10)
+            if e.response.status_code < 500:
+                return False
+            # Back off exponentially on server errors
+            await asyncio.sleep(min(1 << errors, 30))
+            errors += 1
+        except httpx.TransportError as e:
+            logging.error(f"Error checking cluster health for {index}: {str(e)}")
+            # Back off exponentially on network errors
+            await asyncio.sleep(min(1 << errors, 30))
+            errors += 1
     
-    logging.error(f"Index {index} did not become green after {max_attempts} attempts")
+    logging.error(f"Index {index} did not become green within {max_attempts * wait_timeout} seconds")
+    return False
+
+async def process_index(client, snapshot, idx, local_indices, expected_docs, snap_size):
+    """Close, restore, open and wait for a single index."""
+    logging.info(f"Processing index: {idx}")
+
+    if expected_docs is None:
+        logging.error(f"Could not get document count for {idx} from active cluster, skipping")
+        return False
+
+    if idx in local_indices:
+        if not await close_index(client, idx):
+            return False
+
+    if await restore_index(client, snapshot, idx, expected_docs, snap_size):
+        if await open_index(client, idx):
+            if not await wait_for_green(client, idx):
+                logging.warning(f"Index {idx} is in yellow state but may be usable")
+            return True
+        return False
+
+    logging.error(f"Restore failed for {idx}")
     return False
 
+async def restore_batch(snapshot, batch, local_indices, snap_indices):
+    """Restore a batch of indices concurrently, at most RESTORE_CONCURRENCY at a time."""
+    semaphore = asyncio.Semaphore(RESTORE_CONCURRENCY)
+
+    async with create_async_client() as client:
+        # Fetch expected document counts from the active cluster up front
+        expected = await get_many_doc_counts(client, batch, ACTIVE_CLUSTER)
+
+        async def run(idx):
+            async with semaphore:
+                try:
+                    return await process_index(client, snapshot, idx, local_indices,
+                                               expected.get(idx), snap_indices[idx])
+                except Exception as e:
+                    logging.error(f"Unexpected error processing {idx}: {str(e)}")
+                    return False
+
+        return await asyncio.gather(*(run(idx) for idx in batch))
+
 def main():
     logging.info("Starting snapshot restore process")
     
@@ -396,26 +519,13 @@ def main():
         logging.info("No indices need to be restored")
         return
 
-    # Restore each index
-    for idx in batch:
-        logging.info(f"Processing index: {idx}")
-        
-        # Get expected document count from active cluster
-        expected_docs = get_index_doc_count(idx, ACTIVE_CLUSTER)
-        if expected_docs is None:
-            logging.error(f"Could not get document count for {idx} from active cluster, skipping")
-            continue
-            
-        if idx in local_indices:
-            if not close_index(idx):
-                continue
-                
-        if restore_index(snapshot, idx, expected_docs):
-            if open_index(idx):
-                if not wait_for_green(idx):
-                    logging.warning(f"Index {idx} is in yellow state but may be usable")
-        else:
-            logging.error(f"Restore failed for {idx}")
+    # Make sure the passive cluster can see the snapshot before restoring from it
+    if not verify_snapshot_exists(snapshot):
+        logging.error("Snapshot is not available on passive cluster. Exiting.")
+        return
+
+    # Restore indices concurrently
+    asyncio.run(restore_batch(snapshot, batch, local_indices, snap_indices))
 
     logging.info("Snapshot restore process completed")
 
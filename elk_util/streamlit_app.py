@@ -1,6 +1,9 @@
 import streamlit as st
 from elasticsearch import Elasticsearch
 from datetime import datetime, timedelta
+import heapq
+import operator
+import numpy as np
 import pandas as pd
 
 # Initialize Elasticsearch client with SSL
@@ -14,6 +17,15 @@ es = Elasticsearch(
     ca_certs="/path/to/ca.crt"  # Path to your CA certificate
 )
 
+@st.cache_data(ttl=60)
+def fetch_index_sizes():
+    """Fetch index store sizes, cached so widget changes don't re-query Elasticsearch."""
+    stats = es.indices.stats(metric="store", filter_path="indices.*.total.store.size_in_bytes")
+    return [
+        {'index': name, 'size': index['total']['store']['size_in_bytes']}
+        for name, index in stats.get('indices', {}).items()
+    ]
+
 # Streamlit UI
 st.title("Elasticsearch Index Growth")
 
@@ -30,24 +42,15 @@ days = ranges[time_range]
 end_date = datetime.now()
 start_date = end_date - timedelta(days=days)
 
-# Fetch index data
-indices = es.cat.indices(format="json")
-index_stats = []
-
-for index in indices:
-    stats = es.indices.stats(index=index['index'])
-    size_in_bytes = stats['indices'][index['index']]['total']['store']['size_in_bytes']
-    index_stats.append({
-        'index': index['index'],
-        'size': size_in_bytes
-    })
+# Fetch index sizes in bytes
+index_stats = fetch_index_sizes()
 
 # Get top 10 largest indices
-top_10 = sorted(index_stats, key=lambda x: x['size'], reverse=True)[:10]
+top_10 = heapq.nlargest(10, index_stats, key=operator.itemgetter('size'))
 
 # Convert to DataFrame for Streamlit
-df = pd.DataFrame(top_10)
-df['size'] = df['size'] / (1024 * 1024)  # Convert to MB
+sizes_mb = np.fromiter((r['size'] for r in top_10), dtype=np.float64) / (1024.0 * 1024.0)  # Convert to MB
+df = pd.DataFrame({'index': [r['index'] for r in top_10], 'size_mb': sizes_mb})
 
 # Display DataFrame
 st.write(f"Top 10 Indices from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")